@@ -1,18 +1,16 @@
 import asyncio
-import json
 import logging
-import math
 import os
-import re
+import secrets
 import shutil
-import struct
-import subprocess
 import tempfile
-import uuid
 import wave
 
 from contextlib import asynccontextmanager
 
+import numpy as np
+import orjson
+import pyloudnorm as pyln
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
@@ -36,9 +34,17 @@ except ValueError:
     raise ValueError("VOLUME_BOOST must be a number (e.g. 1.0, 3.0)")
 DRY_RUN = os.getenv("DRY_RUN", "0") in ("1", "true", "True", "yes")
 NORMALIZE_VOLUME = os.getenv("NORMALIZE_VOLUME", "0") in ("1", "true", "True", "yes")
+NORMALIZE_METHOD = os.getenv("NORMALIZE_METHOD", "dynaudnorm")
+if NORMALIZE_METHOD not in ("dynaudnorm", "loudnorm", "measured"):
+    raise ValueError("NORMALIZE_METHOD must be 'dynaudnorm', 'loudnorm' or 'measured'")
 QUEUE_GAP_SECONDS = 2
+# Leave recordings this close to the -16 LUFS target untouched. For
+# single-pass loudnorm this is a rough heuristic: it compares volumedetect's
+# unweighted, ungated mean volume (dBFS, pauses included) against the target.
+NORMALIZE_SKIP_DB = 3
 MAX_QUEUE_SIZE = 10
 MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB — generous upper bound for a 1-min recording
+DING_VERSION = "v1"  # bump when generate_ding_wav output changes to invalidate the cache
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("stentor")
@@ -48,6 +54,9 @@ audio_queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
 connected_clients: dict[str, WebSocket] = {}
 audio_temp_dir: str = ""
 ding_file_path: str = ""
+upload_path: str = ""
+player_proc: asyncio.subprocess.Process | None = None
+player_busy_until = 0.0  # loop time at which all PCM written so far has played
 
 
 # --- Ding generation ---
@@ -66,73 +75,74 @@ def generate_ding_wav(path: str) -> None:
         (1046.5, 0.56, 0.22, 0.18),  # C6 — third ding (slightly longer)
     ]
 
-    # First pass: collect raw samples
-    samples = []
-    for i in range(length):
-        t = i / sample_rate
-        val = 0.0
+    # Work in chunks small enough to stay in L1/L2 so each stage reads and
+    # writes cache-resident data instead of streaming whole-buffer temporaries
+    chunk = 4096
+    samples = np.empty(length)
+    for i in range(0, length, chunk):
+        t = np.arange(i, min(i + chunk, length)) / sample_rate
+        acc = samples[i:i + chunk]
+        acc[:] = 0.0
         for freq, start, sustain, release in tones:
-            if t < start:
-                continue
-            dt = t - start
-            end = sustain + release
-            if dt > end:
-                continue
+            # Clamping instead of branching: dt=0 before the tone starts zeroes the
+            # attack, and rel_t clamped to [0, 1] keeps the release at 1 during
+            # sustain and at 0 once the tone has ended
+            dt = np.maximum(t - start, 0.0)
+            rel_t = np.clip((dt - sustain) / release, 0.0, 1.0)
             # Sharp attack, gentle decay during sustain, smooth cosine release
-            att = 1 - math.exp(-dt * 60)
-            if dt < sustain:
-                env = att * math.exp(-dt * 1.5)
-            else:
-                rel_t = (dt - sustain) / release
-                env = att * math.exp(-sustain * 1.5) * 0.5 * (1 + math.cos(math.pi * rel_t))
-            val += env * math.sin(2 * math.pi * freq * dt)
-        samples.append(val)
-
-    # Second pass: peak-normalize to -3 dBFS so the ding is consistently loud
+            att = 1 - np.exp(-dt * 60)
+            decay = np.exp(-np.minimum(dt, sustain) * 1.5)
+            env = att * decay * 0.5 * (1 + np.cos(np.pi * rel_t))
+            acc += env * np.sin(2 * np.pi * freq * dt)
+
+    # Peak-normalize to -3 dBFS so the ding is consistently loud
     # regardless of synthesis amplitude; headroom left for the playback limiter
-    peak = max(abs(v) for v in samples)
+    peak = max(samples.max(), -samples.min())
     target_peak = 10 ** (-3 / 20)  # ≈ 0.708
     scale = target_peak / peak if peak > 0 else 1.0
 
-    raw = bytearray()
-    for val in samples:
-        s = max(-1.0, min(1.0, val * scale))
-        raw.extend(struct.pack("<h", int(s * 32767)))
-
-    # 100ms of silence so the audio driver can flush cleanly
-    raw.extend(b"\x00\x00" * int(sample_rate * 0.10))
+    # Quantize in place, chunk by chunk, straight into the int16 output.
+    # The zeroed tail is 100ms of silence so the audio driver can flush cleanly.
+    pcm = np.zeros(length + int(sample_rate * 0.10), dtype="<i2")
+    for i in range(0, length, chunk):
+        acc = samples[i:i + chunk]
+        acc *= scale
+        np.clip(acc, -1.0, 1.0, out=acc)
+        acc *= 32767
+        pcm[i:i + len(acc)] = acc
 
     with wave.open(path, "w") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
-        wf.writeframes(bytes(raw))
+        wf.writeframes(pcm.tobytes())
 
 
 # --- Audio playback ---
 
-def play_audio_file(filepath: str) -> subprocess.Popen | None:
-    """Spawn ffplay to play an audio file. Returns the process."""
-    if DRY_RUN:
-        logger.info("DRY_RUN: would play %s", filepath)
-        return None
+# Every clip is decoded to this raw format and streamed into one long-lived
+# ffplay, so the audio device and output filters are set up only once.
+PCM_SAMPLE_RATE = 48000
+PCM_CHANNELS = 2
+PCM_BYTES_PER_SECOND = PCM_SAMPLE_RATE * PCM_CHANNELS * 2  # s16le
+
+
+async def start_player() -> asyncio.subprocess.Process | None:
+    """Spawn the persistent ffplay that plays raw PCM from stdin. Returns the process."""
     try:
         env = os.environ.copy()
         if AUDIO_DEVICE:
             env["AUDIODEV"] = AUDIO_DEVICE
-        return subprocess.Popen(
-            [
-                "ffplay", "-nodisp", "-autoexit",
-                "-af", f"highpass=f=80,"
-                       f"acompressor=threshold=-18dB:ratio=3:attack=5:release=100:makeup=2dB,"
-                       f"volume={VOLUME_BOOST},"
-                       f"alimiter=limit=1:attack=5:release=50,"
-                       f"aformat=channel_layouts=stereo",
-                filepath,
-            ],
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
+        return await asyncio.create_subprocess_exec(
+            "ffplay", "-nodisp",
+            "-fflags", "nobuffer", "-analyzeduration", "0", "-probesize", "32",
+            "-f", "s16le", "-ar", str(PCM_SAMPLE_RATE), "-ac", str(PCM_CHANNELS),
+            "-af", f"volume={VOLUME_BOOST},"
+                   f"alimiter=limit=1:attack=5:release=50",
+            "pipe:0",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
             env=env,
         )
     except FileNotFoundError:
@@ -140,62 +150,133 @@ def play_audio_file(filepath: str) -> subprocess.Popen | None:
         return None
 
 
-async def play_and_wait(filepath: str) -> None:
-    """Play an audio file and wait for playback to finish."""
-    proc = play_audio_file(filepath)
-    if proc:
-        await asyncio.to_thread(proc.wait)
-
-
-async def normalize_audio(input_path: str) -> str | None:
-    """Normalize audio loudness using EBU R128 two-pass loudnorm. Returns path or None."""
-    # Pass 1: measure loudness stats
-    proc1 = await asyncio.create_subprocess_exec(
-        "ffmpeg", "-y", "-i", input_path,
-        "-af", "loudnorm=I=-16:TP=-1.5:LRA=11:print_format=json",
-        "-vn", "-f", "null", "-",
-        stdout=asyncio.subprocess.DEVNULL,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    _, stderr1 = await proc1.communicate()
-    if proc1.returncode != 0:
-        logger.warning("loudnorm pass 1 failed (exit %d)", proc1.returncode)
-        return None
-
-    match = re.search(r'\{[^{}]+\}', stderr1.decode(), re.DOTALL)
-    if not match:
-        logger.warning("loudnorm pass 1: could not parse JSON stats")
+async def stop_player() -> None:
+    """Close the persistent ffplay, if running."""
+    global player_proc
+    if player_proc is None:
+        return
+    player_proc.stdin.close()
+    if player_proc.returncode is None:
+        player_proc.terminate()
+        await player_proc.wait()
+    player_proc = None
+
+
+async def play_audio_file(
+    source: str | bytes, normalize: bool = False,
+) -> asyncio.subprocess.Process | None:
+    """Spawn ffmpeg to decode audio to raw PCM on stdout. Returns the process.
+
+    source is either a file path or the encoded audio itself; bytes are
+    fed to ffmpeg over stdin by the caller. With normalize=True,
+    single-pass dynaudnorm is folded into the decode filtergraph so no
+    separate normalization process is needed.
+    """
+    from_memory = isinstance(source, bytes)
+    if DRY_RUN:
+        logger.info(
+            "DRY_RUN: would play %s",
+            f"{len(source)} bytes" if from_memory else source,
+        )
         return None
     try:
-        stats = json.loads(match.group())
-    except json.JSONDecodeError:
-        logger.warning("loudnorm pass 1: JSON decode error")
+        norm = "dynaudnorm=r=0.95:f=10," if normalize else ""
+        return await asyncio.create_subprocess_exec(
+            "ffmpeg", "-loglevel", "error",
+            # Short clips need far less probing than ffmpeg's defaults
+            "-fflags", "nobuffer", "-analyzeduration", "100k", "-probesize", "32k",
+            "-i", "pipe:0" if from_memory else source,
+            "-vn",
+            "-af", f"highpass=f=80,"
+                   f"{norm}"
+                   f"acompressor=threshold=-18dB:ratio=3:attack=5:release=100:makeup=2dB",
+            "-f", "s16le", "-ar", str(PCM_SAMPLE_RATE), "-ac", str(PCM_CHANNELS),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE if from_memory else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        logger.error("ffmpeg not found. Install ffmpeg: sudo apt install ffmpeg")
         return None
 
-    # Pass 2: apply normalization using measured values for accuracy
-    output_path = input_path + ".norm.webm"
-    af = (
-        f"loudnorm=I=-16:TP=-1.5:LRA=11:linear=true"
-        f":measured_I={stats['input_i']}"
-        f":measured_TP={stats['input_tp']}"
-        f":measured_LRA={stats['input_lra']}"
-        f":measured_thresh={stats['input_thresh']}"
-        f":offset={stats['target_offset']}"
-    )
-    proc2 = await asyncio.create_subprocess_exec(
-        "ffmpeg", "-y", "-i", input_path,
+
+async def _pipe_to_player(
+    decoder: asyncio.subprocess.Process, player: asyncio.subprocess.Process,
+) -> int:
+    """Copy decoded PCM into the player's stdin. Returns the number of bytes copied."""
+    copied = 0
+    try:
+        while chunk := await decoder.stdout.read(65536):
+            player.stdin.write(chunk)
+            await player.stdin.drain()
+            copied += len(chunk)
+    except (BrokenPipeError, ConnectionResetError):
+        logger.error("ffplay exited during playback")
+        decoder.kill()
+    await decoder.wait()
+    return copied
+
+
+async def _feed_decoder(decoder: asyncio.subprocess.Process, data: bytes) -> None:
+    """Write encoded audio to the decoder's stdin and close it."""
+    try:
+        decoder.stdin.write(data)
+        await decoder.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        decoder.stdin.close()
+
+
+async def play_and_wait(source: str | bytes, normalize: bool = False) -> None:
+    """Play an audio file or in-memory recording and wait for playback to finish."""
+    global player_proc, player_busy_until
+    proc = await play_audio_file(source, normalize)
+    if not proc:
+        return
+    feeder = None
+    if isinstance(source, bytes):
+        # Feed stdin concurrently with draining stdout so neither pipe fills up
+        feeder = asyncio.create_task(_feed_decoder(proc, source))
+    if player_proc is None or player_proc.returncode is not None:
+        player_proc = await start_player()
+        if not player_proc:
+            proc.kill()
+            await proc.wait()
+            if feeder:
+                await feeder
+            return
+
+    # Writes return once ffplay has buffered the data, so track when the
+    # written audio will actually have finished playing.
+    loop = asyncio.get_running_loop()
+    started = max(loop.time(), player_busy_until)
+    copied = await _pipe_to_player(proc, player_proc)
+    if feeder:
+        await feeder
+    player_busy_until = started + copied / PCM_BYTES_PER_SECOND
+    await asyncio.sleep(max(0.0, player_busy_until - loop.time()))
+
+
+async def _encode_normalized(
+    source_path: str, output_path: str, af: str, label: str,
+) -> str | None:
+    """Run ffmpeg with a loudness filter and encode to Opus. Returns path or None."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y", "-i", source_path,
         "-af", af,
         "-c:a", "libopus", "-b:a", "96k",
         output_path,
         stdout=asyncio.subprocess.DEVNULL,
         stderr=asyncio.subprocess.PIPE,
     )
-    _, stderr2 = await proc2.communicate()
-    if proc2.returncode == 0:
+    _, stderr = await proc.communicate()
+    if proc.returncode == 0:
         return output_path
     logger.warning(
-        "loudnorm pass 2 failed (exit %d): %s",
-        proc2.returncode, stderr2.decode()[-200:],
+        "%s failed (exit %d): %s",
+        label, proc.returncode, stderr.decode()[-200:],
     )
     try:
         os.unlink(output_path)
@@ -204,38 +285,176 @@ async def normalize_audio(input_path: str) -> str | None:
     return None
 
 
+async def _mean_volume(input_path: str) -> float | None:
+    """Estimate mean volume in dBFS from a cheap 8 kHz mono decode. Returns None on failure."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-nostats", "-i", input_path,
+        "-vn", "-ar", "8000", "-ac", "1", "-af", "volumedetect",
+        "-f", "null", "-",
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        return None
+    # "[Parsed_volumedetect_0 @ ...] mean_volume: -23.4 dB"
+    idx = stderr.rfind(b"mean_volume:")
+    if idx == -1:
+        return None
+    try:
+        return float(stderr[idx + len(b"mean_volume:"):].split(b"dB", 1)[0])
+    except ValueError:
+        return None
+
+
+async def normalize_audio(input_path: str) -> str | None:
+    """Normalize audio loudness using single-pass EBU R128 loudnorm. Returns path or None.
+
+    Returns None without encoding when the recording is already close to
+    the target loudness. That check costs an extra 8 kHz decode of every
+    message, including ones that are then normalized.
+    """
+    mean_volume = await _mean_volume(input_path)
+    if mean_volume is not None and abs(mean_volume + 16) < NORMALIZE_SKIP_DB:
+        logger.info(
+            "Skipping loudnorm, mean volume %.1f dBFS is within %d dB of -16 "
+            "(rough RMS precheck, not LUFS)",
+            mean_volume, NORMALIZE_SKIP_DB,
+        )
+        return None
+    return await _encode_normalized(
+        input_path, input_path + ".norm.webm",
+        "loudnorm=I=-16:TP=-1.5:LRA=11", "loudnorm",
+    )
+
+
+async def _channel_count(input_path: str) -> int | None:
+    """Return the channel count of the first audio stream, or None on failure."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffprobe", "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "stream=channels", "-of", "csv=p=0",
+        input_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    try:
+        channels = int(stdout.strip())
+    except ValueError:
+        return None
+    return channels if proc.returncode == 0 and channels > 0 else None
+
+
+async def normalize_audio_measured(input_path: str) -> str | None:
+    """Normalize audio loudness with a measured linear gain. Returns path or None.
+
+    Integrated loudness (EBU R128) is measured in-process with pyloudnorm,
+    then a single ffmpeg pass applies the gain followed by a sample-peak
+    limiter.
+    """
+    channels = await _channel_count(input_path)
+    if channels is None:
+        logger.warning("loudness measurement: could not read channel count")
+        return None
+
+    # Keep the source channel layout: R128 sums channels, so measuring a
+    # downmix would read ~3 LU low for stereo recordings
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-nostats", "-i", input_path,
+        "-vn", "-f", "f32le", "-ar", str(PCM_SAMPLE_RATE), "-ac", str(channels),
+        "pipe:1",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    pcm, _ = await proc.communicate()
+    if proc.returncode != 0:
+        logger.warning("loudness measurement decode failed (exit %d)", proc.returncode)
+        return None
+
+    samples = np.frombuffer(pcm, dtype="<f4")
+    samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    meter = pyln.Meter(PCM_SAMPLE_RATE)
+    try:
+        loudness = await asyncio.to_thread(meter.integrated_loudness, samples)
+    except ValueError:
+        logger.warning("loudness measurement: recording too short")
+        return None
+    if not np.isfinite(loudness):
+        logger.warning("loudness measurement: recording is silent")
+        return None
+
+    # Same loudness target as single-pass loudnorm (-16 LUFS); the limiter
+    # caps sample peaks at -1.5 dBFS (≈ 0.84) rather than true peaks
+    gain_db = -16 - loudness
+    if abs(gain_db) < NORMALIZE_SKIP_DB:
+        logger.info("Skipping normalization, loudness already %.1f LUFS", loudness)
+        return None
+    af = (
+        f"volume={gain_db:.2f}dB,"
+        f"alimiter=limit=0.84:attack=5:release=50:level=0"
+    )
+    return await _encode_normalized(
+        input_path, input_path + ".norm.webm", af, "loudness gain",
+    )
+
+
+def _write_blob(path: str, data: bytes) -> None:
+    """Write an uploaded recording to path, overwriting the previous one."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _clear_files(*paths: str) -> None:
+    """Empty reused audio files in place, keeping their inodes for the next message."""
+    for p in paths:
+        try:
+            os.truncate(p, 0)
+        except FileNotFoundError:
+            pass
+
+
 async def process_queue() -> None:
     """Sequentially play queued audio messages: ding -> message -> gap."""
     while True:
-        filepath, client_id = await audio_queue.get()
-        normalized_path = None
+        audio_data, client_id = await audio_queue.get()
+        wrote_upload = False
         try:
             logger.info(
                 "Playing message from %s (%d queued)",
                 client_id, audio_queue.qsize(),
             )
 
-            if NORMALIZE_VOLUME:
-                normalized_path = await normalize_audio(filepath)
+            play_source = audio_data
+            if NORMALIZE_VOLUME and NORMALIZE_METHOD in ("loudnorm", "measured"):
+                # Both methods encode a normalized copy, so they need the upload
+                # on disk. Messages are processed one at a time, so a single file
+                # (and its .norm.webm copy) is reused and emptied after playback.
+                wrote_upload = True
+                await asyncio.to_thread(_write_blob, upload_path, audio_data)
+                if NORMALIZE_METHOD == "measured":
+                    normalized_path = await normalize_audio_measured(upload_path)
+                else:
+                    normalized_path = await normalize_audio(upload_path)
                 if normalized_path:
                     logger.info("Normalized audio for %s", client_id)
-
-            play_path = normalized_path or filepath
+                    play_source = normalized_path
 
             if ding_file_path:
                 await play_and_wait(ding_file_path)
 
-            await play_and_wait(play_path)
+            await play_and_wait(
+                play_source,
+                normalize=NORMALIZE_VOLUME and NORMALIZE_METHOD == "dynaudnorm",
+            )
 
         except Exception as e:
             logger.error("Error playing audio: %s", e)
         finally:
-            for p in (filepath, normalized_path):
-                if p:
-                    try:
-                        os.unlink(p)
-                    except OSError:
-                        pass
+            # Don't keep the last recording on disk once it has played
+            if wrote_upload:
+                await asyncio.to_thread(
+                    _clear_files, upload_path, upload_path + ".norm.webm",
+                )
 
         if not audio_queue.empty():
             await asyncio.sleep(QUEUE_GAP_SECONDS)
@@ -245,20 +464,40 @@ async def process_queue() -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global audio_temp_dir, ding_file_path
+    global audio_temp_dir, ding_file_path, upload_path, player_proc
 
     audio_temp_dir = tempfile.mkdtemp(prefix="stentor_")
+    upload_path = os.path.join(audio_temp_dir, "upload.webm")
 
     ding_file_path = os.path.join(audio_temp_dir, "ding.wav")
-    generate_ding_wav(ding_file_path)
+    cache_root = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    ding_cache = cache_root / "stentor" / f"ding-{DING_VERSION}.wav"
+    try:
+        shutil.copy(ding_cache, ding_file_path)
+    except OSError:
+        generate_ding_wav(ding_file_path)
+        # Copy to a sibling and rename so an interrupted write never leaves
+        # a truncated file at the cache path
+        tmp_cache = ding_cache.with_name(f"{ding_cache.name}.{os.getpid()}.tmp")
+        try:
+            ding_cache.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(ding_file_path, tmp_cache)
+            os.replace(tmp_cache, ding_cache)
+        except OSError as e:
+            logger.warning("Could not cache ding sound: %s", e)
+            tmp_cache.unlink(missing_ok=True)
     logger.info("Ding sound ready: %s", ding_file_path)
 
+    if not DRY_RUN:
+        player_proc = await start_player()
+
     task = asyncio.create_task(process_queue())
     logger.info("Queue processor started")
 
     yield
 
     task.cancel()
+    await stop_player()
     shutil.rmtree(audio_temp_dir, ignore_errors=True)
 
 
@@ -267,6 +506,16 @@ app = FastAPI(lifespan=lifespan)
 
 # --- Endpoints ---
 
+def _frame(message: dict) -> bytes:
+    """Serialize a control message for ws.send_bytes."""
+    return orjson.dumps(message)
+
+
+# Fixed control messages, serialized once
+QUEUE_FULL_MSG = _frame({"type": "queue_full"})
+TOO_LARGE_MSG = _frame({"type": "error", "message": "recording too large"})
+
+
 @app.get("/config")
 async def get_config():
     return JSONResponse({
@@ -281,11 +530,11 @@ async def get_config():
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
-    client_id = str(uuid.uuid4())[:8]
+    client_id = secrets.token_hex(4)
     connected_clients[client_id] = ws
     logger.info("Client connected: %s (total: %d)", client_id, len(connected_clients))
 
-    await ws.send_text(json.dumps({
+    await ws.send_bytes(_frame({
         "type": "welcome",
         "client_id": client_id,
     }))
@@ -298,7 +547,7 @@ async def websocket_endpoint(ws: WebSocket):
                 if "bytes" in message:
                     audio_data = message["bytes"]
                     if len(audio_data) > MAX_UPLOAD_BYTES:
-                        await ws.send_text(json.dumps({"type": "error", "message": "recording too large"}))
+                        await ws.send_bytes(TOO_LARGE_MSG)
                         logger.warning(
                             "Rejected oversized upload (%d bytes) from %s",
                             len(audio_data), client_id,
@@ -310,22 +559,15 @@ async def websocket_endpoint(ws: WebSocket):
                         )
                     else:
                         if audio_queue.full():
-                            await ws.send_text(json.dumps({
-                                "type": "queue_full",
-                            }))
+                            await ws.send_bytes(QUEUE_FULL_MSG)
                             logger.warning(
                                 "Queue full, rejected message from %s",
                                 client_id,
                             )
                         else:
-                            fd, filepath = tempfile.mkstemp(
-                                suffix=".webm", dir=audio_temp_dir,
-                            )
-                            with os.fdopen(fd, "wb") as f:
-                                f.write(audio_data)
-                            await audio_queue.put((filepath, client_id))
+                            await audio_queue.put((audio_data, client_id))
                             position = audio_queue.qsize()
-                            await ws.send_text(json.dumps({
+                            await ws.send_bytes(_frame({
                                 "type": "queued",
                                 "position": position,
                             }))